@@ -1,18 +1,99 @@
 
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List, Optional
+from collections import deque
 from datetime import datetime
-import numpy as np
+from functools import lru_cache
+from math import exp, isfinite
+from types import MappingProxyType
+import time
+
+# NumPy (and Numba) are imported lazily so the scalar path stays light
+if TYPE_CHECKING:
+    import numpy as np
+
+_HISTORY_DTYPE = [
+    ('gpa', 'f4'),
+    ('test', 'i2'),
+    ('final_score', 'f4'),
+    ('outcome', 'b'),
+    ('ts', 'i8')
+]
+
+@lru_cache(maxsize=4096)
+def _sigmoid_gpa(gpa: float, mean: float, std: float) -> float:
+    # Memoizes on the exact inputs so repeated (school, gpa) pairs hit the cache
+    # without changing the result; the batch paths compute the same value
+    z_score = (gpa - mean) / std
+    if z_score < 0:
+        # Stable form, exp(-z_score) would overflow for very negative z-scores
+        e = exp(z_score)
+        return e / (1.0 + e)
+    return 1.0 / (1.0 + exp(-z_score))
+
+@lru_cache(maxsize=None)
+def _batch_kernel():
+    # JIT kernel for batch scoring, or None when Numba (or the kernel module) is
+    # unavailable. Compiled (or loaded from cache) on the first batch call only.
+    try:
+        from .ScoringKernels import _NUMBA_AVAILABLE, _score_kernel, warm_up
+    except ImportError:
+        # Not imported as part of a package, e.g. run as a script
+        try:
+            from ScoringKernels import _NUMBA_AVAILABLE, _score_kernel, warm_up
+        except ImportError:
+            return None
+    if not _NUMBA_AVAILABLE:
+        return None
+    try:
+        warm_up()
+    except Exception:
+        # e.g. a Numba cache written under a different module name; use NumPy instead
+        return None
+    return _score_kernel
 
 class AdmissionsCalculator:
+    # Confidence = 1 - var(outcome - final_score) over scored history, i.e. how well past
+    # final scores predicted admission, not how spread out the applicant pool is.
+    # Outcomes are 0/1 and scores lie in [0, 1], so the error variance is in [0, 1].
+    DEFAULT_CONFIDENCE = 0.8  # Used until at least two scored history rows exist
+
     def __init__(self, institution_weights: Dict, mission_metrics: Dict, school_profiles: Dict):
         self.weights = institution_weights
         self.mission_metrics = mission_metrics
         self.school_profiles = school_profiles
-        self.audit_log = []
-        self.historical_data = []
+        self.audit_enabled = True
+        self.audit_log = deque(maxlen=100_000)  # (epoch seconds, action, metadata)
+        self._hist_arr = None  # Allocated on first add_historical_data
+        self._hist_n = 0
+        self._confidence = None  # Cached until new historical data arrives
+        self._rebuild_school_table()
+        self._rebuild_mission_cache()
+        self._weights_vec, self._scoring_fn = self._compile_weights(institution_weights)
         
         # Initialize default thresholds
-        self.thresholds = {'Safety': 0.7, 'Target': 0.5, 'Reach': 0.3}
+        self._categories = ('Safety', 'Target', 'Reach')
+        self._conf_thr_values = (0.7, 0.5, 0.0)  # Confidence cut-offs in the same order
+        self._set_thresholds({'Safety': 0.7, 'Target': 0.5, 'Reach': 0.3})
+
+    def _set_thresholds(self, thresholds: Dict):
+        # Score cut-offs per category, checked in order Safety, Target, Reach.
+        # thresholds is exposed read-only; update_thresholds is the only way to change it.
+        score_thr_values = tuple(float(thresholds[c]) for c in self._categories)
+        self.thresholds = MappingProxyType(dict(thresholds))
+        self._score_thr_values = score_thr_values
+
+    def _rebuild_school_table(self):
+        # Resolve school profiles into an index plus (mean, std, competitiveness) rows.
+        # The trailing row holds the defaults and is what index -1 (unknown school) hits.
+        known = [sid for sid, p in self.school_profiles.items() if p]
+        self._school_ids = {sid: i for i, sid in enumerate(known)}
+        self._school_rows = [
+            [float(self.school_profiles[sid].get('gpa_mean', 3.0)),
+             float(self.school_profiles[sid].get('gpa_std', 0.5)),
+             float(self.school_profiles[sid].get('competitiveness', 1.0))]
+            for sid in known
+        ] + [[3.0, 0.5, 1.0]]
+        self._school_arr = None  # NumPy copy for batch scoring, built on first use
 
     class Student:
         def __init__(self, academic_data: Dict, context_data: Dict, 
@@ -22,48 +103,105 @@ class AdmissionsCalculator:
             self.contributions = contributions
             self.mission_alignment = mission_alignment
 
-    def log_audit(self, action: str, metadata: Dict):
-        entry = {
-            'timestamp': datetime.now().isoformat(),
-            'action': action,
-            'metadata': metadata
-        }
-        self.audit_log.append(entry)
+    @staticmethod
+    def _compile_weights(weights: Dict):
+        # Validate weights and build (weights_vec, scoring_fn) without touching any state
+        # Component weights in (academic, contributions, mission_fit) order
+        try:
+            weights_vec = tuple(
+                float(weights[k]) for k in ('academic', 'contributions', 'mission_fit'))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Weights need numeric 'academic', 'contributions' and "
+                             f"'mission_fit' entries, got {weights}") from e
+        # Non-finite weights have no valid literal form in the generated source
+        if not all(isfinite(w) for w in weights_vec):
+            raise ValueError(f"Weights must be finite numbers, got {weights}")
+        # Specialize the weighted sum with the weights baked in as literals.
+        # Works element-wise on NumPy arrays too, so batch scoring shares it.
+        w_acad, w_contrib, w_mission = (repr(w) for w in weights_vec)
+        src = (f"def _scoring_fn(a, c, m):\n"
+               f"    return a * {w_acad} + c * {w_contrib} + m * {w_mission}\n")
+        namespace = {}
+        exec(compile(src, '<scoring_fn>', 'exec'), namespace)
+        return weights_vec, namespace['_scoring_fn']
+
+    def _rebuild_mission_cache(self):
+        # Pre-built metric iteration order and normalizer for calculate_mission_fit
+        self._mission_items = tuple(self.mission_metrics.items())
+        self._mission_weights = dict(self._mission_items)
+        self._mission_weight_sum = sum(self.mission_metrics.values()) or 1.0
+
+    def log_audit(self, action: str, metadata: Dict, timestamp: Optional[float] = None):
+        if not self.audit_enabled:
+            return
+        self.audit_log.append((time.time() if timestamp is None else timestamp, action, metadata))
+
+    def flush_audit(self) -> List[Dict]:
+        # Timestamps are only formatted here, not on every log call
+        return [
+            {'timestamp': datetime.fromtimestamp(t).isoformat(), 'action': a, 'metadata': m}
+            for t, a, m in self.audit_log
+        ]
 
-    def normalize_gpa(self, student: Student) -> float:
+    def export_audit(self, sink=None) -> bytes:
+        # Serialize the raw (timestamp, action, metadata) tuples as JSON arrays.
+        # A queue-like sink receives the bytes directly, with no round-trip through str.
+        import orjson
+        payload = orjson.dumps(list(self.audit_log), option=orjson.OPT_SERIALIZE_NUMPY)
+        if sink is not None:
+            sink.put(payload)
+        return payload
+
+    def _school_index(self, student: Student) -> int:
+        # Row in the school table, -1 when the school has no profile
+        return self._school_ids.get(student.context['school_id'], -1)
+
+    def normalize_gpa(self, student: Student, school_idx: Optional[int] = None) -> float:
         # Get school context for GPA normalization
-        school_profile = self.school_profiles.get(student.context['school_id'], {})
-        if not school_profile:
-            self.log_audit('missing_school_profile', {'school': student.context['school_id']})
+        idx = self._school_index(student) if school_idx is None else school_idx
+        if idx < 0:
+            if self.audit_enabled:
+                self.log_audit('missing_school_profile', {'school': student.context['school_id']})
             return student.academic['gpa'] / 4.0  # Simple normalization fallback
 
-        school_mean = school_profile.get('gpa_mean', 3.0)
-        school_std = school_profile.get('gpa_std', 0.5)
-        z_score = (student.academic['gpa'] - school_mean) / school_std
-        return 1 / (1 + np.exp(-z_score))  # Sigmoid normalization
+        school_mean, school_std, _ = self._school_rows[idx]
+        # Sigmoid normalization
+        return _sigmoid_gpa(student.academic['gpa'], school_mean, school_std)
 
-    def calculate_academic_score(self, student: Student) -> float:
-        gpa_score = self.normalize_gpa(student)
+    def calculate_academic_score(self, student: Student, school_idx: Optional[int] = None) -> float:
+        idx = self._school_index(student) if school_idx is None else school_idx
+        gpa_score = self.normalize_gpa(student, idx)
         test_score = student.academic['test_scores'] / 1600  # SAT normalization
         
         # Dynamic weighting based on school competitiveness
-        school_competitiveness = self.school_profiles.get(
-            student.context['school_id'], {}).get('competitiveness', 1.0)
+        school_competitiveness = self._school_rows[idx][2]
         academic_score = (gpa_score * 0.6 + test_score * 0.4) * school_competitiveness
         
-        self.log_audit('academic_score_calculated', {
-            'gpa_score': gpa_score,
-            'test_score': test_score,
-            'final_score': academic_score
-        })
-        return min(academic_score, 1.0)  # Cap at 1.0
+        if self.audit_enabled:
+            self.log_audit('academic_score_calculated', {
+                'gpa_score': gpa_score,
+                'test_score': test_score,
+                'final_score': academic_score
+            })
+        return academic_score  # Capped only at the final score
 
     def calculate_mission_fit(self, student: Student) -> float:
-        fit_score = sum(
-            student.mission_alignment.get(metric, 0) * weight 
-            for metric, weight in self.mission_metrics.items()
-        )
-        return fit_score / sum(self.mission_metrics.values())  # Normalize
+        alignment = student.mission_alignment
+        if not alignment:
+            return 0.0
+        # Iterate whichever side is smaller
+        if len(alignment) < len(self._mission_items):
+            metrics = self._mission_weights
+            fit_score = sum(
+                value * metrics[metric]
+                for metric, value in alignment.items() if metric in metrics
+            )
+        else:
+            fit_score = sum(
+                alignment.get(metric, 0) * weight 
+                for metric, weight in self._mission_items
+            )
+        return fit_score / self._mission_weight_sum  # Normalize
 
     def apply_context_modifiers(self, student: Student, base_score: float) -> float:
         adjustments = 0
@@ -76,10 +214,11 @@ class AdmissionsCalculator:
         if self.check_legal_compliance(student):
             adjustments += student.context.get('underrepresented_group', 0) * 0.03
         
-        self.log_audit('context_adjustments_applied', {
-            'base_score': base_score,
-            'adjustments': adjustments
-        })
+        if self.audit_enabled:
+            self.log_audit('context_adjustments_applied', {
+                'base_score': base_score,
+                'adjustments': adjustments
+            })
         return min(base_score + adjustments, 1.0)
 
     def check_legal_compliance(self, student: Student) -> bool:
@@ -87,10 +226,28 @@ class AdmissionsCalculator:
         # Would include race/ethnicity usage compliance
         return True
 
+    def _history_array(self) -> 'np.ndarray':
+        if self._hist_arr is None:
+            import numpy as np
+            self._hist_arr = np.zeros(1024, dtype=_HISTORY_DTYPE)
+        return self._hist_arr
+
+    @property
+    def historical_data(self) -> 'np.ndarray':
+        return self._history_array()[:self._hist_n]
+
     def calculate_confidence_score(self, student: Student) -> float:
-        # Placeholder for actual confidence calculation
-        # Would use historical data and prediction variance
-        return 0.8  # Temporary fixed value
+        # Confidence shrinks as historical prediction error grows
+        if self._confidence is None:
+            self._confidence = self.DEFAULT_CONFIDENCE
+            if self._hist_n >= 2:
+                import numpy as np
+                history = self._hist_arr[:self._hist_n]
+                scored = history[~np.isnan(history['final_score'])]
+                if scored.size >= 2:
+                    error_var = float(np.var(scored['outcome'] - scored['final_score']))
+                    self._confidence = 1.0 - error_var
+        return self._confidence
 
     def analyze_intersectionality(self, student: Student) -> float:
         # Placeholder for AI/human rubric analysis
@@ -102,15 +259,11 @@ class AdmissionsCalculator:
         return intersection_score
 
     def calculate_total_score(self, student: Student) -> Dict:
-        academic = self.calculate_academic_score(student)
+        academic = self.calculate_academic_score(student, self._school_index(student))
         contributions = student.contributions['total']
         mission_fit = self.calculate_mission_fit(student)
         
-        base_score = (
-            academic * self.weights['academic'] +
-            contributions * self.weights['contributions'] +
-            mission_fit * self.weights['mission_fit']
-        )
+        base_score = self._scoring_fn(academic, contributions, mission_fit)
         
         context_adjusted = self.apply_context_modifiers(student, base_score)
         intersection_bonus = self.analyze_intersectionality(student)
@@ -129,25 +282,125 @@ class AdmissionsCalculator:
             }
         }
 
+    def calculate_total_score_batch(self, students: List[Student]) -> List[Dict]:
+        # Vectorized equivalent of calculate_total_score over many students.
+        # Per-student audit entries are skipped; one summary entry is logged.
+        n = len(students)
+        if n == 0:
+            return []
+        now = time.time()  # One clock read shared by the whole batch
+        import numpy as np
+
+        if self._school_arr is None:
+            self._school_arr = np.array(self._school_rows, dtype=float)
+        idx = np.array([self._school_index(s) for s in students])
+        has_profile = idx >= 0
+        mean, std, comp = self._school_arr[idx].T
+        gpa = np.array([s.academic['gpa'] for s in students], dtype=float)
+        test = np.array([s.academic['test_scores'] for s in students], dtype=float)
+        contrib = np.array([s.contributions['total'] for s in students], dtype=float)
+        leadership = np.array([s.contributions.get('leadership', 0) for s in students], dtype=float)
+        mission_fit = np.array([self.calculate_mission_fit(s) for s in students], dtype=float)
+        low_income = np.array([bool(s.context.get('low_income', False)) for s in students])
+        adv = np.array([s.context.get('adversity_score', 0) for s in students], dtype=float)
+        under = np.array([
+            s.context.get('underrepresented_group', 0) if self.check_legal_compliance(s) else 0
+            for s in students
+        ], dtype=float)
+
+        score_kernel = _batch_kernel()
+        if score_kernel is not None:
+            final_score, academic = score_kernel(
+                gpa, test, mean, std, comp, has_profile, contrib, mission_fit,
+                adv, low_income, under, leadership, *self._weights_vec)
+        else:
+            # Academic score (sigmoid GPA normalization, fallback for unknown schools)
+            z_score = (gpa - mean) / std
+            e = np.exp(-np.abs(z_score))  # Stable sigmoid, never overflows
+            sigmoid = np.where(z_score < 0, e / (1 + e), 1 / (1 + e))
+            gpa_score = np.where(has_profile, sigmoid, gpa / 4.0)
+            academic = (gpa_score * 0.6 + test / 1600 * 0.4) * comp
+
+            base_score = self._scoring_fn(academic, contrib, mission_fit)
+
+            # Context modifiers and intersectionality bonus
+            adjustments = np.where(low_income, 0.05, 0.0) + adv * 0.1 + under * 0.03
+            context_adjusted = np.minimum(base_score + adjustments, 1.0)
+            intersection_bonus = np.where((adv > 0.7) & (leadership > 0.5), 0.05, 0.0)
+            final_score = np.minimum(context_adjusted + intersection_bonus, 1.0)
+        confidence = [self.calculate_confidence_score(s) for s in students]
+        categories = self.classify_application_batch(final_score, np.array(confidence)).tolist()
+
+        self.log_audit('batch_scores_calculated', {'students': n}, timestamp=now)
+        return [
+            {
+                'final_score': float(final_score[i]),
+                'confidence': confidence[i],
+                'category': categories[i],
+                'component_scores': {
+                    'academic': float(academic[i]),
+                    'contributions': float(contrib[i]),
+                    'mission_fit': float(mission_fit[i])
+                }
+            }
+            for i in range(n)
+        ]
+
     def classify_application(self, score: float, confidence: float) -> str:
-        if score >= self.thresholds['Safety'] and confidence >= 0.7:
+        safety, target, reach = self._score_thr_values
+        safety_conf, target_conf, reach_conf = self._conf_thr_values
+        if score >= safety and confidence >= safety_conf:
             return 'Safety'
-        elif score >= self.thresholds['Target'] and confidence >= 0.5:
+        elif score >= target and confidence >= target_conf:
             return 'Target'
-        elif score >= self.thresholds['Reach']:
+        elif score >= reach and confidence >= reach_conf:
             return 'Reach'
         return 'Below Threshold'
 
+    def classify_application_batch(self, scores: 'np.ndarray', confidences: 'np.ndarray') -> 'np.ndarray':
+        import numpy as np
+        mask = (scores[:, None] >= np.array(self._score_thr_values)) & \
+               (confidences[:, None] >= np.array(self._conf_thr_values))
+        return np.select(list(mask.T), self._categories, default='Below Threshold')
+
+    def update_thresholds(self, thresholds: Dict):
+        self._set_thresholds(thresholds)
+        self.log_audit('thresholds_updated', {'thresholds': thresholds})
+
     def update_weights(self, new_weights: Dict):
+        # Build everything first so invalid weights leave the calculator unchanged
+        weights_vec, scoring_fn = self._compile_weights(new_weights)
         self.weights = new_weights
+        self._weights_vec, self._scoring_fn = weights_vec, scoring_fn
         self.log_audit('weights_updated', {'new_weights': new_weights})
 
-    def add_historical_data(self, student_data: Dict, admission_outcome: bool):
-        self.historical_data.append({
-            'student': student_data,
-            'outcome': admission_outcome,
-            'timestamp': datetime.now().isoformat()
-        })
+    def update_mission_metrics(self, mission_metrics: Dict):
+        self.mission_metrics = mission_metrics
+        self._rebuild_mission_cache()
+        self.log_audit('mission_metrics_updated', {'mission_metrics': mission_metrics})
+
+    def update_school_profiles(self, school_profiles: Dict):
+        self.school_profiles = school_profiles
+        self._rebuild_school_table()
+        self.log_audit('school_profiles_updated', {'schools': len(school_profiles)})
+
+    def add_historical_data(self, student_data: Dict, admission_outcome: bool,
+                            timestamp: Optional[float] = None):
+        # student_data carries the 'academic' dict and, when scored, a 'final_score'
+        hist_arr = self._history_array()
+        if self._hist_n == len(hist_arr):
+            import numpy as np
+            # Grow by doubling; rows past _hist_n are never read
+            hist_arr = self._hist_arr = np.resize(hist_arr, 2 * len(hist_arr))
+        row = hist_arr[self._hist_n]
+        academic = student_data.get('academic', {})
+        row['gpa'] = academic.get('gpa', float('nan'))
+        row['test'] = academic.get('test_scores', 0)
+        row['final_score'] = student_data.get('final_score', float('nan'))
+        row['outcome'] = admission_outcome
+        row['ts'] = int(time.time() if timestamp is None else timestamp)
+        self._hist_n += 1
+        self._confidence = None
 
 # Example Usage
 if __name__ == "__main__":
@@ -1,9 +1,29 @@
 import requests
-from bs4 import BeautifulSoup
-from dataclasses import dataclass
-from typing import Optional, Dict
+import diskcache
+import numpy as np
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, asdict, replace
+from typing import Optional, Dict, List
 
-@dataclass
+try:
+    from selectolax.parser import HTMLParser  # C-backed parser, much faster than bs4
+    _SELECTOLAX_AVAILABLE = True
+except ImportError:
+    from bs4 import BeautifulSoup
+    _SELECTOLAX_AVAILABLE = False
+
+# Shared session so repeated fetches reuse TCP/TLS connections
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+))
+_SESSION.headers.update({'User-Agent': 'CollegePredictor/1.0'})
+
+@dataclass(slots=True, frozen=True)
 class SchoolProfile:
     id: str
     name: str
@@ -14,83 +34,170 @@ class SchoolProfile:
     data_source: str = "unknown"
 
 class SchoolProfileBuilder:
-    def __init__(self):
-        self.cache = {}  # Simple in-memory cache
+    NCES_WAIT = 5  # Seconds to wait on NCES before falling through to CDE
+    DAY = 24 * 60 * 60
+    # Official data is stable, scraped pages change more often
+    SOURCE_TTLS = {'nces': 90 * DAY, 'cde': 30 * DAY, 'web_scraping': 7 * DAY}
+
+    def __init__(self, cache_path: str = ".school_cache", ttl: float = 30 * DAY):
+        self.cache = diskcache.Cache(cache_path)  # Persistent on-disk cache
+        self.ttl = ttl  # Fallback TTL for sources not in SOURCE_TTLS
+        self._pool = ThreadPoolExecutor(max_workers=4)
+
+    def close(self):
+        """Release the fetch thread pool and the on-disk cache"""
+        # Don't block on fetches still in flight (e.g. a timed-out NCES call)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
         
     def get_school_profile(self, school_id: str) -> SchoolProfile:
         # Check cache first
-        if school_id in self.cache:
-            return self.cache[school_id]
+        cached = self.cache.get(school_id)
+        if cached is not None:
+            return SchoolProfile(**cached)
         
-        # Try data sources in priority order
-        profile = self._get_nces_data(school_id) or \
-                  self._get_cde_data(school_id) or \
-                  self._scrape_school_data(school_id)
+        # Fetch official sources concurrently, then take them in priority order
+        nces_future = self._pool.submit(self._get_nces_data, school_id)
+        cde_future = self._pool.submit(self._get_cde_data, school_id)
+        try:
+            profile = nces_future.result(timeout=self.NCES_WAIT)
+        except FutureTimeoutError:
+            nces_future.cancel()  # No effect once running; the worker frees up when it returns
+            profile = None
+        if profile is not None:
+            cde_future.cancel()
+        profile = profile or cde_future.result() or self._scrape_school_data(school_id)
         
+        return self._finalize_profile(profile)
+
+    def get_school_profiles_batch(self, school_ids: List[str],
+                                  batch_size: int = 200) -> Dict[str, SchoolProfile]:
+        """Build many profiles with one API request per source per batch of ids"""
+        profiles = {}
+        missing = []
+        for school_id in dict.fromkeys(school_ids):
+            cached = self.cache.get(school_id)
+            if cached is not None:
+                profiles[school_id] = SchoolProfile(**cached)
+            else:
+                missing.append(school_id)
+
+        for start in range(0, len(missing), batch_size):
+            chunk = missing[start:start + batch_size]
+            # Same source priority as get_school_profile
+            fetched = self._get_nces_data_batch(chunk)
+            remaining = [sid for sid in chunk if sid not in fetched]
+            if remaining:
+                fetched.update(self._get_cde_data_batch(remaining))
+            for school_id in chunk:
+                profile = fetched.get(school_id) or self._scrape_school_data(school_id)
+                profiles[school_id] = self._finalize_profile(profile)
+        return profiles
+
+    def _finalize_profile(self, profile: SchoolProfile) -> SchoolProfile:
         # Validate minimum data requirements
         if profile.gpa_mean is None:
             profile = self._estimate_gpa_stats(profile)
             
-        self.cache[school_id] = profile
+        # Placeholder profiles from failed fetches are not persisted,
+        # so a transient network error is retried on the next lookup
+        if profile.data_source != "unknown":
+            self.cache.set(profile.id, asdict(profile),
+                           expire=self.SOURCE_TTLS.get(profile.data_source, self.ttl))
         return profile
     
     def _get_nces_data(self, school_id: str) -> Optional[SchoolProfile]:
         """National Center for Education Statistics API"""
+        return self._get_nces_data_batch([school_id]).get(school_id)
+
+    def _get_cde_data(self, school_id: str) -> Optional[SchoolProfile]:
+        """California Department of Education Data"""
+        return self._get_cde_data_batch([school_id]).get(school_id)
+    
+    def _get_nces_data_batch(self, school_ids: List[str]) -> Dict[str, SchoolProfile]:
+        """National Center for Education Statistics API, many schools per request"""
         try:
-            # Mock NCES API response
-            nces_data = {
-                "school_name": "Sample High School",
-                "gpa_mean": 3.4,
-                "gpa_std": 0.3,
-                "ap_courses": 15
+            # Mock NCES batch API response
+            nces_data = [
+                {
+                    "school_id": school_id,
+                    "school_name": "Sample High School",
+                    "gpa_mean": 3.4,
+                    "gpa_std": 0.3,
+                    "ap_courses": 15
+                }
+                for school_id in school_ids
+            ]
+
+            return {
+                d["school_id"]: SchoolProfile(
+                    id=d["school_id"],
+                    name=d["school_name"],
+                    gpa_mean=d["gpa_mean"],
+                    gpa_std=d["gpa_std"],
+                    ap_courses=d["ap_courses"],
+                    data_source="nces"
+                )
+                for d in nces_data
             }
-            
-            return SchoolProfile(
-                id=school_id,
-                name=nces_data["school_name"],
-                gpa_mean=nces_data["gpa_mean"],
-                gpa_std=nces_data["gpa_std"],
-                ap_courses=nces_data["ap_courses"],
-                data_source="nces"
-            )
         except Exception as e:
             print(f"NCES API Error: {str(e)}")
-            return None
+            return {}
 
-    def _get_cde_data(self, school_id: str) -> Optional[SchoolProfile]:
-        """California Department of Education Data"""
+    def _get_cde_data_batch(self, school_ids: List[str]) -> Dict[str, SchoolProfile]:
+        """California Department of Education Data, many schools per request"""
         try:
-            # Mock CDE API response
-            cde_data = {
-                "school_name": "CA Sample High",
-                "uc_csu_eligibility": 0.72,
-                "ap_count": 22
+            # Mock CDE batch API response
+            cde_data = [
+                {
+                    "school_id": school_id,
+                    "school_name": "CA Sample High",
+                    "uc_csu_eligibility": 0.72,
+                    "ap_count": 22
+                }
+                for school_id in school_ids
+            ]
+
+            # Convert all UC eligibility rates to estimated GPAs in one pass
+            rates = np.fromiter((d["uc_csu_eligibility"] for d in cde_data), float, len(cde_data))
+            gpa_means = self._uc_eligibility_to_gpa(rates).tolist()
+            return {
+                d["school_id"]: SchoolProfile(
+                    id=d["school_id"],
+                    name=d["school_name"],
+                    gpa_mean=gpa_mean,
+                    gpa_std=0.25,  # Default assumption
+                    ap_courses=d["ap_count"],
+                    data_source="cde"
+                )
+                for d, gpa_mean in zip(cde_data, gpa_means)
             }
-            
-            # Convert UC eligibility rate to estimated GPA
-            return SchoolProfile(
-                id=school_id,
-                name=cde_data["school_name"],
-                gpa_mean=self._uc_eligibility_to_gpa(cde_data["uc_csu_eligibility"]),
-                gpa_std=0.25,  # Default assumption
-                ap_courses=cde_data["ap_count"],
-                data_source="cde"
-            )
         except Exception as e:
             print(f"CDE API Error: {str(e)}")
-            return None
-    
+            return {}
+
     def _scrape_school_data(self, school_id: str) -> SchoolProfile:
         """Fallback web scraper"""
         try:
             # Mock school website URL pattern
             url = f"https://www.{school_id}.edu/profile"
-            response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = _SESSION.get(url, timeout=10)
             
             # Example scraping logic
-            name = soup.find('h1', class_='school-name').text
-            gpa_text = soup.find('div', class_='stats').text
+            if _SELECTOLAX_AVAILABLE:
+                tree = HTMLParser(response.text)
+                name = tree.css_first('h1.school-name').text()
+                gpa_text = tree.css_first('div.stats').text()
+            else:
+                soup = BeautifulSoup(response.text, 'html.parser')
+                name = soup.find('h1', class_='school-name').text
+                gpa_text = soup.find('div', class_='stats').text
             gpa_mean = float(gpa_text.split("Average GPA: ")[1].split()[0])
             
             return SchoolProfile(
@@ -104,29 +211,26 @@ class SchoolProfileBuilder:
             print(f"Scraping Error: {str(e)}")
             return SchoolProfile(id=school_id, name="Unknown School")
     
-    def _uc_eligibility_to_gpa(self, eligibility_rate: float) -> float:
-        """Convert UC eligibility rate to estimated GPA (California-specific)"""
-        # Based on historical correlation
+    def _uc_eligibility_to_gpa(self, eligibility_rate):
+        """Convert UC eligibility rate(s) to estimated GPA (California-specific)"""
+        # Based on historical correlation; arrays are converted in one ufunc pass
+        if isinstance(eligibility_rate, np.ndarray):
+            return np.round(3.0 + eligibility_rate * 0.7, 1)
         return round(3.0 + (eligibility_rate * 0.7), 1)
     
     def _estimate_gpa_stats(self, profile: SchoolProfile) -> SchoolProfile:
         """Fallback estimation when no data available"""
         if profile.ap_courses:
-            profile.gpa_mean = 3.2 + (profile.ap_courses * 0.02)
-            profile.gpa_std = 0.35
-        else:
-            profile.gpa_mean = 3.0
-            profile.gpa_std = 0.4
-        return profile
+            return replace(profile, gpa_mean=3.2 + (profile.ap_courses * 0.02), gpa_std=0.35)
+        return replace(profile, gpa_mean=3.0, gpa_std=0.4)
 
 # Usage Example
 if __name__ == "__main__":
-    builder = SchoolProfileBuilder()
-    
-    # Try with official data first
-    school = builder.get_school_profile("nces_12345")
-    print(f"Official Data Profile:\n{school}\n")
-    
-    # Force fallback to scraping
-    unknown_school = builder.get_school_profile("unknown_HS_456")
-    print(f"Scraped Profile:\n{unknown_school}")   
\ No newline at end of file
+    with SchoolProfileBuilder() as builder:
+        # Try with official data first
+        school = builder.get_school_profile("nces_12345")
+        print(f"Official Data Profile:\n{school}\n")
+        
+        # Force fallback to scraping
+        unknown_school = builder.get_school_profile("unknown_HS_456")
+        print(f"Scraped Profile:\n{unknown_school}")   
\ No newline at end of file
@@ -0,0 +1,138 @@
+import random
+
+import numpy as np
+import pytest
+
+import AdmissionCalculator
+from AdmissionCalculator import AdmissionsCalculator
+
+WEIGHTS = {'academic': 0.4, 'contributions': 0.3, 'mission_fit': 0.3}
+MISSION_METRICS = {'diversity': 0.4, 'community_impact': 0.6}
+SCHOOL_PROFILES = {
+    'HS_123': {'gpa_mean': 3.8, 'gpa_std': 0.2, 'competitiveness': 1.2},
+    'HS_456': {'gpa_mean': 3.4, 'gpa_std': 0.4, 'competitiveness': 0.9},
+    'HS_narrow': {'gpa_mean': 3.8, 'gpa_std': 0.004},
+}
+
+
+def make_calculator():
+    return AdmissionsCalculator(dict(WEIGHTS), dict(MISSION_METRICS), SCHOOL_PROFILES)
+
+
+def random_students(calculator, n=500, seed=0):
+    rng = random.Random(seed)
+    return [
+        calculator.Student(
+            {'gpa': round(rng.uniform(0.5, 4.0), 3), 'test_scores': rng.randint(800, 1600)},
+            {'school_id': rng.choice(['HS_123', 'HS_456', 'HS_narrow', 'HS_unknown']),
+             'low_income': rng.random() < 0.5,
+             'adversity_score': rng.random(),
+             'underrepresented_group': rng.random() < 0.3},
+            {'total': rng.random(), 'leadership': rng.random()},
+            {} if i % 5 == 0 else {'diversity': rng.random(), 'community_impact': rng.random()}
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(params=['numba', 'numpy'])
+def batch_backend(request, monkeypatch):
+    if request.param == 'numpy':
+        monkeypatch.setattr(AdmissionCalculator, '_batch_kernel', lambda: None)
+    elif AdmissionCalculator._batch_kernel() is None:
+        pytest.skip("Numba is not available")
+    return request.param
+
+
+def test_batch_matches_scalar(batch_backend):
+    calculator = make_calculator()
+    students = random_students(calculator)
+    # Very negative z-score at the narrow school, beyond exp's range
+    students.append(calculator.Student(
+        {'gpa': 0.5, 'test_scores': 1000}, {'school_id': 'HS_narrow'}, {'total': 0.5}, {}))
+
+    batch = calculator.calculate_total_score_batch(students)
+    for student, batch_result in zip(students, batch):
+        scalar_result = calculator.calculate_total_score(student)
+        assert batch_result['final_score'] == pytest.approx(scalar_result['final_score'], abs=1e-9)
+        assert batch_result['category'] == scalar_result['category']
+        for k, v in scalar_result['component_scores'].items():
+            assert batch_result['component_scores'][k] == pytest.approx(v, abs=1e-9)
+
+
+def test_normalize_gpa_does_not_overflow():
+    calculator = make_calculator()
+    student = calculator.Student(
+        {'gpa': 0.5, 'test_scores': 1000}, {'school_id': 'HS_narrow'}, {'total': 0.5}, {})
+    assert calculator.normalize_gpa(student) == pytest.approx(0.0)
+    assert calculator.calculate_total_score(student)['final_score'] == pytest.approx(0.25)
+
+
+def test_historical_data_grows_past_initial_capacity():
+    calculator = make_calculator()
+    for i in range(2500):
+        calculator.add_historical_data(
+            {'academic': {'gpa': 3.0, 'test_scores': i % 1600}, 'final_score': 0.5},
+            i % 2 == 0, timestamp=i)
+
+    history = calculator.historical_data
+    assert len(history) == 2500
+    assert history['test'][0] == 0 and history['ts'][0] == 0
+    assert history['test'][-1] == 2499 % 1600 and history['ts'][-1] == 2499
+    assert history['outcome'].sum() == 1250
+
+
+def test_confidence_tracks_prediction_error():
+    calculator = make_calculator()
+    assert calculator.calculate_confidence_score(None) == calculator.DEFAULT_CONFIDENCE
+
+    # A diverse pool whose scores predict outcomes well keeps a high confidence
+    rng = random.Random(0)
+    for _ in range(3000):
+        score = rng.random()
+        calculator.add_historical_data({'final_score': score}, score > 0.5)
+    assert calculator.calculate_confidence_score(None) > 0.9
+
+
+def test_classify_application_batch():
+    calculator = make_calculator()
+    scores = np.array([0.9, 0.9, 0.6, 0.6, 0.4, 0.1, 0.9])
+    confidences = np.array([0.8, 0.6, 0.6, 0.4, 0.9, 0.9, 0.1])
+    expected = ['Safety', 'Target', 'Target', 'Reach', 'Reach',
+                'Below Threshold', 'Reach']
+
+    assert calculator.classify_application_batch(scores, confidences).tolist() == expected
+    assert [calculator.classify_application(s, c)
+            for s, c in zip(scores, confidences)] == expected
+
+
+def test_thresholds_are_read_only():
+    calculator = make_calculator()
+    with pytest.raises(TypeError):
+        calculator.thresholds['Safety'] = 0.9
+
+    calculator.update_thresholds({'Safety': 0.9, 'Target': 0.5, 'Reach': 0.3})
+    assert calculator.classify_application(0.8, 0.9) == 'Target'
+
+
+@pytest.mark.parametrize('bad_weights', [
+    {'academic': 1.0},
+    {'academic': 'high', 'contributions': 0.3, 'mission_fit': 0.3},
+    {'academic': None, 'contributions': 0.3, 'mission_fit': 0.3},
+    {'academic': float('inf'), 'contributions': 0.3, 'mission_fit': 0.3},
+    {'academic': float('nan'), 'contributions': 0.3, 'mission_fit': 0.3},
+])
+def test_update_weights_rejects_invalid_weights(bad_weights):
+    calculator = make_calculator()
+    with pytest.raises(ValueError):
+        calculator.update_weights(bad_weights)
+
+    assert calculator.weights == WEIGHTS
+    assert calculator._weights_vec == (0.4, 0.3, 0.3)
+    assert calculator._scoring_fn(1.0, 1.0, 1.0) == pytest.approx(1.0)
+
+
+def test_update_weights_applies_valid_weights():
+    calculator = make_calculator()
+    calculator.update_weights({'academic': 0.5, 'contributions': 0.25, 'mission_fit': 0.25})
+    assert calculator._scoring_fn(1.0, 2.0, 4.0) == pytest.approx(2.0)
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+import School_profiles
+from School_profiles import SchoolProfile, SchoolProfileBuilder
+
+
+@pytest.fixture
+def builder(tmp_path):
+    with SchoolProfileBuilder(cache_path=str(tmp_path / "cache")) as builder:
+        yield builder
+
+
+def remaining_ttl(builder, school_id):
+    _, expire_time = builder.cache.get(school_id, expire_time=True)
+    return expire_time - time.time()
+
+
+def test_profiles_are_cached_with_source_ttl(builder):
+    profile = builder.get_school_profile("HS_1")
+    assert profile.data_source == "nces"
+    assert remaining_ttl(builder, "HS_1") == pytest.approx(SchoolProfileBuilder.SOURCE_TTLS["nces"], abs=60)
+    assert builder.get_school_profile("HS_1") == profile
+
+
+def test_scraped_profiles_use_shorter_ttl(builder, monkeypatch):
+    monkeypatch.setattr(builder, "_get_nces_data", lambda school_id: None)
+    monkeypatch.setattr(builder, "_get_cde_data", lambda school_id: None)
+    monkeypatch.setattr(builder, "_scrape_school_data", lambda school_id: SchoolProfile(
+        id=school_id, name="Scraped High", gpa_mean=3.5, gpa_std=0.3, data_source="web_scraping"))
+
+    builder.get_school_profile("HS_2")
+    assert remaining_ttl(builder, "HS_2") == pytest.approx(
+        SchoolProfileBuilder.SOURCE_TTLS["web_scraping"], abs=60)
+
+
+def test_placeholder_profiles_are_not_cached(builder, monkeypatch):
+    monkeypatch.setattr(builder, "_get_nces_data", lambda school_id: None)
+    monkeypatch.setattr(builder, "_get_cde_data", lambda school_id: None)
+    monkeypatch.setattr(builder, "_scrape_school_data",
+                        lambda school_id: SchoolProfile(id=school_id, name="Unknown School"))
+
+    profile = builder.get_school_profile("HS_3")
+    assert profile.data_source == "unknown"
+    assert profile.gpa_mean is not None  # Filled in by _estimate_gpa_stats
+    assert "HS_3" not in builder.cache
+
+
+def test_batch_profiles_match_single_lookups(builder):
+    profiles = builder.get_school_profiles_batch(["HS_4", "HS_5", "HS_4"], batch_size=1)
+    assert set(profiles) == {"HS_4", "HS_5"}
+    assert profiles["HS_4"] == builder._get_nces_data("HS_4")
+
+
+def test_cde_batch_converts_eligibility_to_gpa(builder):
+    profile = builder._get_cde_data_batch(["HS_6"])["HS_6"]
+    assert profile.gpa_mean == builder._uc_eligibility_to_gpa(0.72)
+
+
+def test_close_releases_pool_and_cache(tmp_path):
+    builder = SchoolProfileBuilder(cache_path=str(tmp_path / "cache"))
+    builder.close()
+    with pytest.raises(RuntimeError):
+        builder._pool.submit(print)